@@ -1,9 +1,14 @@
+import bisect
+import contextlib
+import io
 import json
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any, Protocol
-from abc import ABC, abstractmethod
+from abc import abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Deque, Protocol, Set, TextIO, Tuple
 import datetime
 import random
+import sys
 from enum import Enum
 
 # ----------------------------------
@@ -15,14 +20,17 @@ class PostType(Enum):
     IMAGE = "image"
     VIDEO = "video"
 
-@dataclass
+_POST_TYPES: Tuple[PostType, ...] = tuple(PostType)
+_POSTTYPE_BY_VALUE: Dict[str, PostType] = {member.value: member for member in _POST_TYPES}
+
+@dataclass(slots=True)
 class User:
     id: str
     name: str
     username: str
     avatar_url: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Post:
     id: str
     user: User
@@ -31,18 +39,19 @@ class Post:
     likes: int = 0
     comments: int = 0
     shares: int = 0
-    timestamp: datetime.datetime = datetime.datetime.now()
+    timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)
     media_url: Optional[str] = None
     liked: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
+        user = self.user
         return {
             "id": self.id,
             "user": {
-                "id": self.user.id,
-                "name": self.user.name,
-                "username": self.user.username,
-                "avatar_url": self.user.avatar_url
+                "id": user.id,
+                "name": user.name,
+                "username": user.username,
+                "avatar_url": user.avatar_url
             },
             "content": self.content,
             "type": self.type.value,
@@ -56,22 +65,29 @@ class Post:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Post':
+        user = data["user"]
+        try:
+            post_type = _POSTTYPE_BY_VALUE[data["type"]]
+        except (KeyError, TypeError):
+            # Let the enum raise its usual ValueError for unknown values
+            post_type = PostType(data["type"])
+        get = data.get
         return cls(
             id=data["id"],
             user=User(
-                id=data["user"]["id"],
-                name=data["user"]["name"],
-                username=data["user"]["username"],
-                avatar_url=data["user"].get("avatar_url")
+                id=user["id"],
+                name=user["name"],
+                username=user["username"],
+                avatar_url=user.get("avatar_url")
             ),
             content=data["content"],
-            type=PostType(data["type"]),
-            likes=data.get("likes", 0),
-            comments=data.get("comments", 0),
-            shares=data.get("shares", 0),
+            type=post_type,
+            likes=get("likes", 0),
+            comments=get("comments", 0),
+            shares=get("shares", 0),
             timestamp=datetime.datetime.fromisoformat(data["timestamp"]),
-            media_url=data.get("media_url"),
-            liked=data.get("liked", False)
+            media_url=get("media_url"),
+            liked=get("liked", False)
         )
 
 class PostRepositoryProtocol(Protocol):
@@ -84,80 +100,131 @@ class PostRepositoryProtocol(Protocol):
     def add_post(self, post: Post) -> bool:
         ...
 
+def _newest_first_key(post: Post) -> datetime.timedelta:
+    # Grows as posts get older, so bisect can search a newest-first feed
+    # while still comparing the exact datetimes
+    return datetime.datetime.max - post.timestamp
+
+_PAGE_CACHE_SIZE = 32
+
 class MockPostRepository:
     def __init__(self):
         self.posts: List[Post] = []
+        self._by_id: Dict[str, Post] = {}
+        # Pages keyed on (offset, limit) in least-recently-used order;
+        # cleared whenever add_post changes the feed
+        self._page_cache: Dict[Tuple[int, int], Tuple[Post, ...]] = {}
         self._generate_mock_data()
     
     def _generate_mock_data(self):
-        users = [
+        users = (
             User(id="1", name="John Doe", username="johndoe", avatar_url="https://example.com/avatar1.jpg"),
             User(id="2", name="Jane Smith", username="janesmith", avatar_url="https://example.com/avatar2.jpg"),
             User(id="3", name="Bob Johnson", username="bobjohnson", avatar_url="https://example.com/avatar3.jpg"),
-        ]
+        )
+        now = datetime.datetime.now()
+        deltas = [datetime.timedelta(hours=h) for h in range(73)]
+        count = 20
+        posts: List[Post] = []
         
-        for i in range(1, 21):
-            user = random.choice(users)
-            post_type = random.choice(list(PostType))
-            content = f"This is a sample post #{i} with some content."
+        # Draw every random field in one batch per column instead of per post
+        post_users = random.choices(users, k=count)
+        post_types = random.choices(_POST_TYPES, k=count)
+        likes = random.choices(range(101), k=count)
+        comments = random.choices(range(51), k=count)
+        shares = random.choices(range(31), k=count)
+        ages = random.choices(deltas, k=count)
+        
+        for i in range(count):
+            post_type = post_types[i]
+            number = i + 1
+            content = f"This is a sample post #{number} with some content."
             media_url = None
             
             if post_type == PostType.IMAGE:
-                content = f"Check out this image post #{i}"
+                content = f"Check out this image post #{number}"
                 media_url = "https://example.com/image.jpg"
             elif post_type == PostType.VIDEO:
-                content = f"Video post #{i} - watch this!"
+                content = f"Video post #{number} - watch this!"
                 media_url = "https://example.com/video.mp4"
             
-            self.posts.append(
-                Post(
-                    id=str(i),
-                    user=user,
-                    content=content,
-                    type=post_type,
-                    likes=random.randint(0, 100),
-                    comments=random.randint(0, 50),
-                    shares=random.randint(0, 30),
-                    timestamp=datetime.datetime.now() - datetime.timedelta(hours=random.randint(0, 72)),
-                    media_url=media_url
-                )
+            post = Post(
+                id=str(number),
+                user=post_users[i],
+                content=content,
+                type=post_type,
+                likes=likes[i],
+                comments=comments[i],
+                shares=shares[i],
+                timestamp=now - ages[i],
+                media_url=media_url
             )
+            posts.append(post)
+            self._by_id[post.id] = post
+        
+        # Keep the feed newest-first so pages are plain slices
+        posts.sort(key=lambda p: p.timestamp, reverse=True)
+        self.posts.extend(posts)
     
     def fetch_posts(self, limit: int, offset: int) -> List[Post]:
-        return sorted(self.posts[offset:offset+limit], key=lambda p: p.timestamp, reverse=True)
+        key = (offset, limit)
+        page = self._page_cache.pop(key, None)
+        if page is None:
+            if len(self._page_cache) >= _PAGE_CACHE_SIZE:
+                # Dicts keep insertion order, so the first key is the least
+                # recently used page
+                del self._page_cache[next(iter(self._page_cache))]
+            page = tuple(self.posts[offset:offset+limit])
+        # Re-inserting moves the page to the most recently used end
+        self._page_cache[key] = page
+        # A fresh list each time so callers cannot alter the cached page
+        return list(page)
     
     def like_post(self, post_id: str) -> bool:
-        for post in self.posts:
-            if post.id == post_id:
-                post.likes += 1
-                post.liked = True
-                return True
-        return False
+        post = self._by_id.get(post_id)
+        if post is None:
+            return False
+        post.likes += 1
+        post.liked = True
+        return True
     
     def add_post(self, post: Post) -> bool:
-        self.posts.insert(0, post)
+        if not self.posts or post.timestamp >= self.posts[0].timestamp:
+            self.posts.insert(0, post)
+        else:
+            bisect.insort_left(self.posts, post, key=_newest_first_key)
+        # The most recently added post owns its id
+        self._by_id[post.id] = post
+        self._page_cache.clear()
         return True
 
 # ----------------------------------
 # ViewModel Layer
 # ----------------------------------
 
-class Observer(ABC):
+class Observer(Protocol):
     @abstractmethod
     def update(self, *args, **kwargs):
-        pass
+        ...
 
 class Observable:
     def __init__(self):
-        self._observers: List[Observer] = []
+        # Replaced wholesale on every change, so notify can iterate a snapshot
+        # even if an observer subscribes or unsubscribes during dispatch
+        self._observers: Tuple[Observer, ...] = ()
+        # Identities of registered observers, for O(1) membership checks that
+        # never call a subclass's __eq__
+        self._observer_ids: Set[int] = set()
     
     def add_observer(self, observer: Observer):
-        if observer not in self._observers:
-            self._observers.append(observer)
+        if id(observer) not in self._observer_ids:
+            self._observer_ids.add(id(observer))
+            self._observers = self._observers + (observer,)
     
     def remove_observer(self, observer: Observer):
-        if observer in self._observers:
-            self._observers.remove(observer)
+        if id(observer) in self._observer_ids:
+            self._observer_ids.discard(id(observer))
+            self._observers = tuple(o for o in self._observers if o is not observer)
     
     def notify_observers(self, *args, **kwargs):
         for observer in self._observers:
@@ -167,7 +234,8 @@ class FeedViewModel(Observable):
     def __init__(self, repository: PostRepositoryProtocol):
         super().__init__()
         self.repository = repository
-        self.posts: List[Post] = []
+        self.posts: Deque[Post] = deque()
+        self._posts_by_id: Dict[str, Post] = {}
         self.is_loading = False
         self.error: Optional[str] = None
         self.current_page = 0
@@ -181,7 +249,11 @@ class FeedViewModel(Observable):
         
         try:
             new_posts = self.repository.fetch_posts(limit=self.page_size, offset=0)
-            self.posts = new_posts
+            self.posts = deque(new_posts)
+            # First post wins an id, matching a front-to-back scan
+            self._posts_by_id = {}
+            for post in new_posts:
+                self._posts_by_id.setdefault(post.id, post)
             self.current_page = 1
             self.has_more = len(new_posts) == self.page_size
         except Exception as e:
@@ -203,6 +275,8 @@ class FeedViewModel(Observable):
                 offset=self.current_page * self.page_size
             )
             self.posts.extend(new_posts)
+            for post in new_posts:
+                self._posts_by_id.setdefault(post.id, post)
             self.current_page += 1
             self.has_more = len(new_posts) == self.page_size
         except Exception as e:
@@ -219,11 +293,10 @@ class FeedViewModel(Observable):
     def like_post(self, post_id: str):
         success = self.repository.like_post(post_id)
         if success:
-            for post in self.posts:
-                if post.id == post_id:
-                    post.likes += 1
-                    post.liked = True
-                    break
+            post = self._posts_by_id.get(post_id)
+            if post is not None:
+                post.likes += 1
+                post.liked = True
             self.notify_observers()
     
     def create_post(self, content: str, post_type: PostType, media_url: Optional[str] = None):
@@ -239,7 +312,9 @@ class FeedViewModel(Observable):
         
         success = self.repository.add_post(new_post)
         if success:
-            self.posts.insert(0, new_post)
+            self.posts.appendleft(new_post)
+            # The new post is now first in the feed, so it owns its id
+            self._posts_by_id[new_post.id] = new_post
             self.notify_observers()
             return True
         return False
@@ -248,74 +323,101 @@ class FeedViewModel(Observable):
 # View Layer (simplified for console demonstration)
 # ----------------------------------
 
+_HEADER_RULE = "=" * 50
+_HEADER_OPENER = "\n" + _HEADER_RULE
+_POST_RULE = "-" * 50
+_POST_OPENER = "\n" + _POST_RULE
+
 class FeedView(Observer):
     def __init__(self, view_model: FeedViewModel):
         self.view_model = view_model
+        # Frame buffer while render() runs; None means print straight to stdout
+        self._out: Optional[TextIO] = None
         self.view_model.add_observer(self)
     
     def update(self, *args, **kwargs):
         self.render()
     
     def render(self):
-        print("\n" + "="*50)
-        print("SOCIAL MEDIA FEED")
-        print("="*50)
+        # Build the whole frame in memory (plugin output included) and emit
+        # it with one write instead of one per printed line; whatever was
+        # drawn is still written if rendering fails partway
+        buffer = io.StringIO()
+        previous, self._out = self._out, buffer
+        try:
+            self._render_feed()
+        finally:
+            self._out = previous
+            sys.stdout.write(buffer.getvalue())
+    
+    def _render_feed(self):
+        out = self._out
+        print(_HEADER_OPENER, file=out)
+        print("SOCIAL MEDIA FEED", file=out)
+        print(_HEADER_RULE, file=out)
         
         if self.view_model.error:
-            print(f"\nError: {self.view_model.error}\n")
+            print(f"\nError: {self.view_model.error}\n", file=out)
         
         if not self.view_model.posts and self.view_model.is_loading:
-            print("\nLoading posts...\n")
+            print("\nLoading posts...\n", file=out)
             return
         
         for post in self.view_model.posts:
             self._render_post(post)
         
         if self.view_model.is_loading and self.view_model.posts:
-            print("\nLoading more posts...\n")
+            print("\nLoading more posts...\n", file=out)
         elif self.view_model.has_more:
-            print("\nScroll to load more...\n")
+            print("\nScroll to load more...\n", file=out)
         else:
-            print("\nNo more posts to load.\n")
+            print("\nNo more posts to load.\n", file=out)
     
     def _render_post(self, post: Post):
-        print("\n" + "-"*50)
-        print(f"{post.user.name} (@{post.user.username})")
-        print(f"Posted at: {post.timestamp.strftime('%Y-%m-%d %H:%M')}")
-        print("\n" + post.content)
+        out = self._out
+        print(_POST_OPENER, file=out)
+        print(f"{post.user.name} (@{post.user.username})", file=out)
+        print(f"Posted at: {post.timestamp:%Y-%m-%d %H:%M}", file=out)
+        print("\n" + post.content, file=out)
         
         if post.type == PostType.IMAGE:
-            print(f"\n[IMAGE: {post.media_url}]")
+            print(f"\n[IMAGE: {post.media_url}]", file=out)
         elif post.type == PostType.VIDEO:
-            print(f"\n[VIDEO: {post.media_url}]")
+            print(f"\n[VIDEO: {post.media_url}]", file=out)
         
         like_status = "♥" if post.liked else "♡"
-        print(f"\n{like_status} {post.likes} likes | 💬 {post.comments} comments | ↪ {post.shares} shares")
-        print("-"*50)
+        print(f"\n{like_status} {post.likes} likes | 💬 {post.comments} comments | ↪ {post.shares} shares", file=out)
+        print(_POST_RULE, file=out)
 
 # ----------------------------------
 # Plugin System for Custom Feed Items
 # ----------------------------------
 
-class FeedItemPlugin(ABC):
+class FeedItemPlugin(Protocol):
     @abstractmethod
     def can_handle(self, post: Post) -> bool:
-        pass
+        ...
     
     @abstractmethod
     def render(self, post: Post):
-        pass
+        ...
 
-class ImagePostPlugin(FeedItemPlugin):
+class TypedPostPlugin(FeedItemPlugin):
+    # Base for plugins that render exactly one post type; PluginFeedView
+    # dispatches these by dict lookup unless they override can_handle
+    handled_type: PostType
+    
     def can_handle(self, post: Post) -> bool:
-        return post.type == PostType.IMAGE
+        return post.type == self.handled_type
+
+class ImagePostPlugin(TypedPostPlugin):
+    handled_type = PostType.IMAGE
     
     def render(self, post: Post):
         print(f"\n[IMAGE CONTENT: {post.media_url}]\n{post.content}")
 
-class VideoPostPlugin(FeedItemPlugin):
-    def can_handle(self, post: Post) -> bool:
-        return post.type == PostType.VIDEO
+class VideoPostPlugin(TypedPostPlugin):
+    handled_type = PostType.VIDEO
     
     def render(self, post: Post):
         print(f"\n[VIDEO PREVIEW: {post.media_url}]\n{post.content}")
@@ -323,16 +425,47 @@ class VideoPostPlugin(FeedItemPlugin):
 class PluginFeedView(FeedView):
     def __init__(self, view_model: FeedViewModel, plugins: List[FeedItemPlugin]):
         super().__init__(view_model)
-        self.plugins = plugins
+        # Dispatch is indexed once here, so keep an immutable snapshot rather
+        # than a list that could be changed behind the index's back
+        self.plugins: Tuple[FeedItemPlugin, ...] = tuple(plugins)
+        # Typed plugins that match purely on handled_type are indexed by type
+        # and any other plugin is kept for an ordered scan; both keep their
+        # list position so the first plugin in the list still wins
+        self._plugin_by_type: Dict[PostType, Tuple[int, FeedItemPlugin]] = {}
+        self._fallback_plugins: List[Tuple[int, FeedItemPlugin]] = []
+        for position, plugin in enumerate(self.plugins):
+            if isinstance(plugin, TypedPostPlugin) and type(plugin).can_handle is TypedPostPlugin.can_handle:
+                self._plugin_by_type.setdefault(plugin.handled_type, (position, plugin))
+            else:
+                self._fallback_plugins.append((position, plugin))
     
     def _render_post(self, post: Post):
-        for plugin in self.plugins:
+        typed = self._plugin_by_type.get(post.type)
+        typed_position = typed[0] if typed is not None else len(self.plugins)
+        
+        # Only plugins registered ahead of the typed match may claim the post
+        for position, plugin in self._fallback_plugins:
+            if position >= typed_position:
+                break
             if plugin.can_handle(post):
-                plugin.render(post)
+                self._render_with_plugin(plugin, post)
                 return
         
+        if typed is not None:
+            self._render_with_plugin(typed[1], post)
+            return
+        
         # Default rendering if no plugin handles this post type
         super()._render_post(post)
+    
+    def _render_with_plugin(self, plugin: FeedItemPlugin, post: Post):
+        # Plugins print to stdout, so only their own call is pointed at the
+        # frame buffer to keep their output in place
+        if self._out is None:
+            plugin.render(post)
+            return
+        with contextlib.redirect_stdout(self._out):
+            plugin.render(post)
 
 # ----------------------------------
 # Application Setup and Usage